@@ -9,6 +9,7 @@ associations on Windows. It is designed to be run after installing the
 
 import argparse
 import contextlib
+import functools
 import importlib.resources
 import io
 import os
@@ -45,6 +46,11 @@ _SYSTEM_CONDA_ROOTS = [
     Path("/usr/local/anaconda3"),
 ]
 
+# Directory of the entry-point script (the pip console_scripts wrapper),
+# resolved once: realpath stats every path component. Module-level so
+# tests can patch it.
+_SCRIPT_DIR = Path(sys.argv[0] if sys.argv else sys.executable).resolve().parent
+
 # MIME type registered for .pmeprj on Linux; the icon name is derived from
 # it per the freedesktop spec ('/' -> '-').
 LINUX_MIME_TYPE = "application/x-moleditpy-project"
@@ -152,6 +158,18 @@ def _extract_data_file(file_name: str, system: bool = False) -> Optional[str]:
         return None
 
 
+@functools.cache
+def _resolve_icon(icon_name: str) -> Optional[str]:
+    """
+    Extract the app icon *icon_name* once per process.
+
+    Shortcuts, bundles and registry entries all reference the same
+    extracted file, so re-extracting it on every lookup only repeats the
+    importlib.resources traversal and the write.
+    """
+    return _extract_data_file(icon_name)
+
+
 def get_icon_path() -> Optional[str]:
     """
     Gets the absolute path to the correct icon file based on the OS.
@@ -171,9 +189,15 @@ def get_icon_path() -> Optional[str]:
         print(f"Warning: Unsupported operating system for icon selection: {system}")
         return None
 
-    return _extract_data_file(icon_name)
+    icon_path = _resolve_icon(icon_name)
+    if icon_path is None:
+        # Don't cache a failed extraction (e.g. a transient write error):
+        # the next lookup should try again.
+        _resolve_icon.cache_clear()
+    return icon_path
 
 
+@functools.cache
 def find_executable(name: str) -> Optional[str]:
     """
     Finds the path to the specified executable.
@@ -183,7 +207,12 @@ def find_executable(name: str) -> Optional[str]:
       2. Same directory as sys.executable.
       3. Same directory as sys.argv[0] (direct script invocation).
       4. User-local install dirs (~/.local/bin on Linux/macOS; user-level Scripts on Windows).
-      5. System PATH via shutil.which.
+      5. System PATH (each PATHEXT extension on Windows).
+
+    The result is cached per process: the search probes dozens of
+    directories and the TUI resolves the executable once for its status
+    line and again on Install. Call ``find_executable.cache_clear()`` to
+    force a fresh search.
 
     Args:
         name (str): The name of the executable (e.g., 'moleditpy').
@@ -214,8 +243,7 @@ def find_executable(name: str) -> Optional[str]:
             return found
 
     # 3. Same directory as the entry-point script (pip-installed console_scripts wrapper)
-    script_dir = Path(sys.argv[0]).resolve().parent
-    found = _check(script_dir)
+    found = _check(_SCRIPT_DIR)
     if found:
         return found
 
@@ -395,11 +423,22 @@ def find_executable(name: str) -> Optional[str]:
             if found:
                 return found
 
-    # 5. Fallback: system PATH
-    path_from_shutil = shutil.which(name)
-    if path_from_shutil:
-        print(f"Found executable in system PATH: {path_from_shutil}")
-        return path_from_shutil
+    # 5. Fallback: system PATH. Probed directly instead of via shutil.which,
+    # which on Windows (Python 3.12+) can return an extensionless,
+    # non-executable match ahead of the real moleditpy.exe.
+    if system == "Windows":
+        pathext = os.environ.get("PATHEXT") or ".COM;.EXE;.BAT;.CMD"
+        extensions = [ext.lower() for ext in pathext.split(os.pathsep) if ext]
+    else:
+        extensions = [""]
+    for path_dir in os.environ.get("PATH", "").split(os.pathsep):
+        if not path_dir:
+            continue
+        for ext in extensions:
+            candidate = Path(path_dir) / f"{name}{ext}"
+            if candidate.is_file() and os.access(candidate, os.X_OK):
+                print(f"Found executable in system PATH: {candidate}")
+                return str(candidate)
 
     return None
 
@@ -423,6 +462,32 @@ def _notify_windows_assoc_changed() -> None:
         pass  # not on Windows / shell32 unavailable
 
 
+def _expandable_registry_path(path: str, system: bool = False) -> str:
+    """
+    Rewrite *path* relative to a profile environment variable for a
+    REG_EXPAND_SZ registry value (e.g. ``%LOCALAPPDATA%\\Programs\\...``),
+    so the association survives a relocated or renamed user profile.
+
+    Per-user variables are never used for a machine-wide (HKLM)
+    registration, where they would expand differently for every user.
+    """
+    if system:
+        env_vars = ("PROGRAMDATA",)
+    else:  # most specific first: both AppData dirs live under USERPROFILE
+        env_vars = ("LOCALAPPDATA", "APPDATA", "USERPROFILE")
+    for var in env_vars:
+        base = os.environ.get(var)
+        if not base:
+            continue
+        try:
+            rel = os.path.relpath(path, base)
+        except ValueError:  # different drive
+            continue
+        if rel != os.curdir and rel.split(os.sep)[0] != os.pardir:
+            return f"%{var}%{os.sep}{rel}"
+    return path
+
+
 def register_file_associations_windows(
     exe_path: str, icon_path: Optional[str], system: bool = False
 ) -> bool:
@@ -431,17 +496,24 @@ def register_file_associations_windows(
 
     Args:
         exe_path (str): Path to the executable to associate.
-        icon_path (Optional[str]): Path to the icon file for the association.
+        icon_path (Optional[str]): Path to the icon file for the association,
+            as returned by get_file_icon_path()/get_icon_path() (which only
+            return files they have just written); None skips DefaultIcon.
         system (bool): Register machine-wide under HKLM (requires admin)
             instead of per-user under HKCU.
 
     Returns:
         bool: True if successful, False otherwise.
+
+    On failure, the keys this call created under Software\\Classes are
+    deleted again. A ProgID or extension key that an earlier install
+    registered and this call was overwriting is removed with them.
     """
     if platform.system() != "Windows":
         return False
 
     root = winreg.HKEY_LOCAL_MACHINE if system else winreg.HKEY_CURRENT_USER
+    written = []  # subkeys of Software\Classes created so far, for rollback
 
     try:
         extensions = [".pmeprj"]
@@ -450,44 +522,70 @@ def register_file_associations_windows(
 
         print("Registering file associations...")
 
-        # Create ProgID
-        with winreg.CreateKey(root, f"Software\\Classes\\{prog_id}") as key:
-            winreg.SetValue(key, "", winreg.REG_SZ, f"{app_name} File")
-
-        # Set default icon
-        if icon_path and os.path.exists(icon_path):
-            with winreg.CreateKey(
-                root, f"Software\\Classes\\{prog_id}\\DefaultIcon"
-            ) as key:
-                winreg.SetValue(key, "", winreg.REG_SZ, icon_path)
-
-        # Friendly context-menu label for the open verb
-        with winreg.CreateKey(
-            root, f"Software\\Classes\\{prog_id}\\shell\\open"
-        ) as key:
-            winreg.SetValue(key, "", winreg.REG_SZ, f"Open with {app_name}")
-
-        # Set open command
-        # Quote paths to handle spaces
-        command = f'"{exe_path}" "%1"'
-        with winreg.CreateKey(
-            root,
-            f"Software\\Classes\\{prog_id}\\shell\\open\\command",
-        ) as key:
-            winreg.SetValue(key, "", winreg.REG_SZ, command)
-
-        # Associate extensions
-        for ext in extensions:
-            with winreg.CreateKey(root, f"Software\\Classes\\{ext}") as key:
-                winreg.SetValue(key, "", winreg.REG_SZ, prog_id)
-            print(f"  Associated {ext} with {app_name}")
+        # Open Software\Classes once and create every key relative to it
+        # (and to the ProgID) instead of walking the path from the hive
+        # root for each key.
+        with winreg.CreateKey(root, "Software\\Classes") as classes_key:
+            # Create ProgID
+            with winreg.CreateKeyEx(
+                classes_key, prog_id, 0, winreg.KEY_WRITE
+            ) as prog_key:
+                written.append(prog_id)
+                winreg.SetValue(prog_key, "", winreg.REG_SZ, f"{app_name} File")
+
+                # Set default icon (already extracted by the caller)
+                if icon_path:
+                    with winreg.CreateKeyEx(
+                        prog_key, "DefaultIcon", 0, winreg.KEY_WRITE
+                    ) as key:
+                        winreg.SetValueEx(
+                            key,
+                            "",
+                            0,
+                            winreg.REG_EXPAND_SZ,
+                            _expandable_registry_path(icon_path, system),
+                        )
+
+                # Friendly context-menu label for the open verb
+                with winreg.CreateKeyEx(
+                    prog_key, "shell\\open", 0, winreg.KEY_WRITE
+                ) as open_key:
+                    winreg.SetValue(
+                        open_key, "", winreg.REG_SZ, f"Open with {app_name}"
+                    )
+
+                    # Set open command
+                    # Quote paths to handle spaces
+                    command = f'"{_expandable_registry_path(exe_path, system)}" "%1"'
+                    with winreg.CreateKeyEx(
+                        open_key, "command", 0, winreg.KEY_WRITE
+                    ) as key:
+                        winreg.SetValueEx(key, "", 0, winreg.REG_EXPAND_SZ, command)
+
+            # Associate extensions
+            for ext in extensions:
+                with winreg.CreateKeyEx(classes_key, ext, 0, winreg.KEY_WRITE) as key:
+                    written.append(ext)
+                    winreg.SetValue(key, "", winreg.REG_SZ, prog_id)
+                print(f"  Associated {ext} with {app_name}")
 
         _notify_windows_assoc_changed()
         print("File associations registered successfully.")
         return True
 
-    except OSError as e:
+    except OSError as e:  # everything winreg raises
         print(f"Failed to register file associations: {e}")
+        # Don't leave a half-written ProgID/extension behind: remove only
+        # what this call created (not .pmeraw or Explorer's FileExts), so
+        # the next install starts from a clean state.
+        if written:
+            print("Rolling back the partial registration...")
+        for name in reversed(written):
+            key_path = f"Software\\Classes\\{name}"
+            try:
+                delete_registry_tree(root, key_path)
+            except OSError as rollback_error:
+                print(f"  Failed to remove {key_path}: {rollback_error}")
         return False
 
 
@@ -798,24 +896,39 @@ def write_linux_system_desktop_entry(
         return False
 
 
-def delete_registry_tree(key, sub_key):
+def delete_registry_tree(key, sub_key) -> bool:
     """
     Deletes a registry key and all its subkeys.
+
+    Returns False when the key does not exist (already gone). Any other
+    OSError (e.g. access denied) propagates so callers can report it.
     """
     try:
         current_key = winreg.OpenKey(key, sub_key, 0, winreg.KEY_ALL_ACCESS)
-        num_subkeys = winreg.QueryInfoKey(current_key)[0]
-        for _ in range(num_subkeys):
-            # Always delete index 0 — keys shift down as each is removed
-            subkey_name = winreg.EnumKey(current_key, 0)
-            delete_registry_tree(current_key, subkey_name)
+    except FileNotFoundError:
+        return False
 
+    try:
+        # Always delete index 0 — keys shift down as each is removed;
+        # EnumKey raises OSError once no subkeys are left.
+        while True:
+            try:
+                subkey_name = winreg.EnumKey(current_key, 0)
+            except OSError:
+                break
+            if not delete_registry_tree(current_key, subkey_name):
+                # Listed but not openable (dangling link, concurrent
+                # writer): stop instead of re-enumerating it forever.
+                # DeleteKey below then reports the non-empty key.
+                break
+    finally:
         winreg.CloseKey(current_key)
+
+    try:
         winreg.DeleteKey(key, sub_key)
-        return True
-    except OSError:
-        # Key doesn't exist or access denied — treat as already gone
+    except FileNotFoundError:
         return False
+    return True
 
 
 def unregister_file_associations_windows(system: bool = False) -> None:
@@ -829,28 +942,44 @@ def unregister_file_associations_windows(system: bool = False) -> None:
     root = winreg.HKEY_LOCAL_MACHINE if system else winreg.HKEY_CURRENT_USER
 
     print("Unregistering file associations...")
-    keys_to_remove = [
-        (root, "Software\\Classes\\.pmeprj"),
-        (root, "Software\\Classes\\.pmeraw"),
-    ]
+    extensions = [".pmeprj", ".pmeraw"]
 
     # ProgID might have subkeys (shell, DefaultIcon), so we need recursive delete
-    prog_id_key = "Software\\Classes\\MoleditPy.File"
+    prog_id = "MoleditPy.File"
 
     try:
-        # Remove extension associations
-        for root, key_path in keys_to_remove:
-            try:
-                winreg.DeleteKey(root, key_path)
-                print(f"  Removed registry key: {key_path}")
-            except FileNotFoundError:
-                pass  # Already gone
-            except OSError as e:
-                print(f"  Failed to remove {key_path}: {e}")
-
-        # Remove ProgID recursively
-        if delete_registry_tree(root, prog_id_key):
-            print(f"  Removed registry tree: {prog_id_key}")
+        # Open Software\Classes once; every deletion below is one hop off
+        # this handle instead of a walk from the hive root.
+        try:
+            classes_key = winreg.OpenKey(root, "Software\\Classes", 0, winreg.KEY_WRITE)
+        except FileNotFoundError:
+            classes_key = None  # nothing was ever registered here
+        except OSError as e:
+            # e.g. access denied on HKLM without elevation; the per-user
+            # Explorer cache below can still be cleared
+            print(f"  Failed to open Software\\Classes: {e}")
+            classes_key = None
+
+        if classes_key is not None:
+            with classes_key:
+                # Remove extension associations
+                for ext in extensions:
+                    key_path = f"Software\\Classes\\{ext}"
+                    try:
+                        winreg.DeleteKey(classes_key, ext)
+                        print(f"  Removed registry key: {key_path}")
+                    except FileNotFoundError:
+                        pass  # Already gone
+                    except OSError as e:
+                        print(f"  Failed to remove {key_path}: {e}")
+
+                # Remove ProgID recursively
+                prog_id_key = f"Software\\Classes\\{prog_id}"
+                try:
+                    if delete_registry_tree(classes_key, prog_id):
+                        print(f"  Removed registry tree: {prog_id_key}")
+                except OSError as e:
+                    print(f"  Failed to remove {prog_id_key}: {e}")
 
         # Explorer pins its own per-user choice under FileExts; without
         # removing it (and notifying), the association looks still present.
@@ -859,8 +988,11 @@ def unregister_file_associations_windows(system: bool = False) -> None:
                 "Software\\Microsoft\\Windows\\CurrentVersion\\"
                 f"Explorer\\FileExts\\{ext}"
             )
-            if delete_registry_tree(winreg.HKEY_CURRENT_USER, file_exts_key):
-                print(f"  Removed Explorer cache: {file_exts_key}")
+            try:
+                if delete_registry_tree(winreg.HKEY_CURRENT_USER, file_exts_key):
+                    print(f"  Removed Explorer cache: {file_exts_key}")
+            except OSError as e:
+                print(f"  Failed to remove {file_exts_key}: {e}")
 
         _notify_windows_assoc_changed()
         print("File associations unregistered.")
@@ -868,6 +1000,131 @@ def unregister_file_associations_windows(system: bool = False) -> None:
         print(f"Error during file association removal: {e}")
 
 
+def _shortcut_path(location: str, system_scope: bool = False) -> Optional[Path]:
+    """
+    Where the MoleditPy shortcut for *location* ("app_menu" or "desktop")
+    lives on this OS, or None when there is no such location (e.g. no
+    system-wide Desktop on Linux/macOS).
+    """
+    system = platform.system()
+    shortcut_name = "MoleditPy"
+
+    if system == "Windows":
+        if location == "app_menu":
+            if system_scope:
+                base = os.environ.get("PROGRAMDATA") or "C:/ProgramData"
+            else:
+                base = os.environ.get("APPDATA")
+            if not base:
+                return None
+            return (
+                Path(base)
+                / "Microsoft"
+                / "Windows"
+                / "Start Menu"
+                / "Programs"
+                / f"{shortcut_name}.lnk"
+            )
+        if system_scope:
+            home = Path(os.environ.get("PUBLIC") or "C:/Users/Public")
+        else:
+            home = Path.home()
+        return home / "Desktop" / f"{shortcut_name}.lnk"
+
+    if system == "Linux":
+        if location == "app_menu":
+            apps_dir = linux_data_home(system_scope) / "applications"
+            return apps_dir / f"{shortcut_name}.desktop"
+        if system_scope:
+            return None  # Desktop shortcuts are per-user
+        return Path.home() / "Desktop" / f"{shortcut_name}.desktop"
+
+    if system == "Darwin":
+        if location == "app_menu":
+            if system_scope:
+                return Path("/Applications") / f"{shortcut_name}.app"
+            return Path.home() / "Applications" / f"{shortcut_name}.app"
+        if system_scope:
+            return None
+        return Path.home() / "Desktop" / f"{shortcut_name}.app"
+
+    return None
+
+
+def _shortcut_command(target_script: str, target_args: str) -> str:
+    """The command line handed to pyshortcuts for *target_script*."""
+    if target_args:
+        # Quote target_script to handle spaces if we have arguments
+        return f'"{target_script}" {target_args}'
+    # Pass raw path if no arguments, so pyshortcuts can verify file existence
+    return target_script
+
+
+def _same_path(a: str, b: str) -> bool:
+    """Compare two paths the way the file system would (case on Windows)."""
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def _shortcut_up_to_date(
+    shortcut_path: Path,
+    target_script: str,
+    target_args: str,
+    icon_path: Optional[str],
+    file_assoc: bool = False,
+) -> bool:
+    """
+    True when the shortcut at *shortcut_path* already launches
+    *target_script* with *target_args* (and shows *icon_path*), so
+    recreating it — a COM round-trip on Windows — can be skipped.
+    On Linux the entry must also carry the MIME binding exactly when
+    *file_assoc* is requested. Anything unreadable or unexpected counts
+    as out of date.
+    """
+    if not shortcut_path.is_file():
+        return False
+
+    system = platform.system()
+    if system == "Windows":
+        try:
+            import win32com.client
+
+            with _com_initialized():
+                link = win32com.client.Dispatch("WScript.Shell").CreateShortcut(
+                    str(shortcut_path)
+                )
+                target = link.TargetPath.strip('"')
+                arguments = link.Arguments.strip()
+                icon = link.IconLocation.rsplit(",", 1)[0]
+                del link  # release the COM object before CoUninitialize
+        except Exception:  # ImportError or pywintypes.com_error (not OSError)
+            return False
+        return (
+            _same_path(target, target_script)
+            and arguments == target_args.strip()
+            and (not icon_path or _same_path(icon, icon_path))
+        )
+
+    if system == "Linux":
+        try:
+            lines = shortcut_path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return False
+        entry = dict(line.split("=", 1) for line in lines if "=" in line)
+        exec_line = entry.get("Exec", "")
+        patched = "MimeType" in entry
+        for field_code in (" %f", " %F"):  # added by _patch_linux_desktop_entry
+            if exec_line.endswith(field_code):
+                exec_line = exec_line[: -len(field_code)]
+                patched = True
+        return (
+            exec_line == _shortcut_command(target_script, target_args)
+            and patched == file_assoc
+            and (not icon_path or _same_path(entry.get("Icon", ""), icon_path))
+        )
+
+    return False
+
+
 def remove_shortcut(system_scope: bool = False) -> None:
     """
     Removes the created shortcuts and file associations.
@@ -876,8 +1133,6 @@ def remove_shortcut(system_scope: bool = False) -> None:
     (/usr/share on Linux, /Applications on macOS; requires root).
     """
     system = platform.system()
-    shortcut_paths = []
-    shortcut_name = "MoleditPy"
 
     if system_scope and not is_root():
         if system == "Windows":
@@ -892,65 +1147,28 @@ def remove_shortcut(system_scope: bool = False) -> None:
             )
 
     if system == "Windows":
-        # Usually in APPDATA/Microsoft/Windows/Start Menu/Programs
-        appdata = os.environ.get("APPDATA")
-        if appdata:
-            shortcut_paths.append(
-                Path(appdata)
-                / "Microsoft"
-                / "Windows"
-                / "Start Menu"
-                / "Programs"
-                / f"{shortcut_name}.lnk"
-            )
-        # pyshortcuts also creates a Desktop shortcut
-        shortcut_paths.append(Path.home() / "Desktop" / f"{shortcut_name}.lnk")
-
         unregister_file_associations_windows()
-
         if system_scope:
-            program_data = os.environ.get("PROGRAMDATA") or "C:/ProgramData"
-            public = os.environ.get("PUBLIC") or "C:/Users/Public"
-            shortcut_paths.append(
-                Path(program_data)
-                / "Microsoft"
-                / "Windows"
-                / "Start Menu"
-                / "Programs"
-                / f"{shortcut_name}.lnk"
-            )
-            shortcut_paths.append(Path(public) / "Desktop" / f"{shortcut_name}.lnk")
             unregister_file_associations_windows(system=True)
 
     elif system == "Linux":
-        # Usually in ~/.local/share/applications/ plus a Desktop copy
-        home = Path.home()
-        shortcut_paths.append(
-            linux_data_home() / "applications" / f"{shortcut_name}.desktop"
-        )
-        shortcut_paths.append(home / "Desktop" / f"{shortcut_name}.desktop")
-
         unregister_file_associations_linux()
-
         if system_scope:
-            shortcut_paths.append(
-                linux_data_home(system=True)
-                / "applications"
-                / f"{shortcut_name}.desktop"
-            )
             unregister_file_associations_linux(system=True)
 
-    elif system == "Darwin":
-        home = Path.home()
-        shortcut_paths.append(home / "Applications" / f"{shortcut_name}.app")
-        shortcut_paths.append(home / "Desktop" / f"{shortcut_name}.app")
-        if system_scope:
-            shortcut_paths.append(Path("/Applications") / f"{shortcut_name}.app")
-
-    else:
+    elif system != "Darwin":
         print(f"Removal not fully supported/automated for OS: {system}")
         return
 
+    # Start Menu / application menu entry and Desktop copy (pyshortcuts
+    # creates both), plus the all-users locations for a system install
+    shortcut_paths = []
+    for scope in (False, True) if system_scope else (False,):
+        for location in ("app_menu", "desktop"):
+            path = _shortcut_path(location, system_scope=scope)
+            if path is not None:
+                shortcut_paths.append(path)
+
     removed_any = False
     for shortcut_path in shortcut_paths:
         if shortcut_path.exists():
@@ -978,6 +1196,7 @@ def remove_shortcut(system_scope: bool = False) -> None:
             shutil.rmtree(get_persistent_data_dir(system=True), ignore_errors=True)
     except OSError:
         pass
+    _resolve_icon.cache_clear()  # the cached paths are gone now
 
 
 def get_file_icon_path(system: bool = False) -> Optional[str]:
@@ -1119,39 +1338,14 @@ def _move_windows_shortcuts_to_all_users(desktop: bool, app_menu: bool) -> None:
     (ProgramData Start Menu / Public Desktop). pyshortcuts only writes
     per-user paths, so a system-wide install moves them afterwards.
     """
-    name = "MoleditPy"
-    moves = []
-    appdata = os.environ.get("APPDATA")
-    program_data = os.environ.get("PROGRAMDATA") or "C:/ProgramData"
-    public = os.environ.get("PUBLIC") or "C:/Users/Public"
-
-    if app_menu and appdata:
-        moves.append(
-            (
-                Path(appdata)
-                / "Microsoft"
-                / "Windows"
-                / "Start Menu"
-                / "Programs"
-                / f"{name}.lnk",
-                Path(program_data)
-                / "Microsoft"
-                / "Windows"
-                / "Start Menu"
-                / "Programs"
-                / f"{name}.lnk",
-            )
-        )
-    if desktop:
-        moves.append(
-            (
-                Path.home() / "Desktop" / f"{name}.lnk",
-                Path(public) / "Desktop" / f"{name}.lnk",
-            )
-        )
+    moves = [
+        (_shortcut_path(location), _shortcut_path(location, system_scope=True))
+        for location, enabled in (("app_menu", app_menu), ("desktop", desktop))
+        if enabled
+    ]
 
     for src, dest in moves:
-        if not src.is_file():
+        if src is None or not src.is_file():
             continue
         try:
             dest.parent.mkdir(parents=True, exist_ok=True)
@@ -1213,7 +1407,7 @@ def install(options: Optional[InstallOptions] = None) -> int:
     original_exe_path = find_executable(command_name)
 
     # On Linux the package may install as 'moleditpy-linux' instead of 'moleditpy'
-    if not original_exe_path and platform.system() == "Linux":
+    if not original_exe_path and system == "Linux":
         alt_name = "moleditpy-linux"
         print(f"Not found. Trying alternate name '{alt_name}'...")
         original_exe_path = find_executable(alt_name)
@@ -1226,6 +1420,10 @@ def install(options: Optional[InstallOptions] = None) -> int:
         print("its Scripts/bin directory is accessible.")
         return 1
 
+    # find_executable() only reports a hit on its first (uncached) call,
+    # e.g. inside the TUI's silenced detection worker.
+    print(f"Using executable: {original_exe_path}")
+
     # If Conda environment
     if conda_env and conda_exe:
         print(f"Conda environment detected: {conda_env}")
@@ -1256,12 +1454,7 @@ def install(options: Optional[InstallOptions] = None) -> int:
         print(f"Targeting: {target_script} {target_args}")
 
         # Prepare script with arguments
-        if target_args:
-            # Quote target_script to handle spaces if we have arguments
-            full_command = f'"{target_script}" {target_args}'
-        else:
-            # Pass raw path if no arguments, so pyshortcuts can verify file existence
-            full_command = target_script
+        full_command = _shortcut_command(target_script, target_args)
 
         if system in ("Windows", "Linux"):
             if options.desktop or options.app_menu:
@@ -1274,31 +1467,56 @@ def install(options: Optional[InstallOptions] = None) -> int:
                             "skipped for a system-wide install."
                         )
                 else:
-                    with _com_initialized():
-                        make_shortcut(
-                            script=full_command,
-                            name=shortcut_name,
-                            icon=icon_path,
-                            desktop=options.desktop,
-                            startmenu=options.app_menu,
-                            noexe=True,
-                        )
-                    if system == "Windows" and options.system:
-                        _move_windows_shortcuts_to_all_users(
-                            options.desktop, options.app_menu
-                        )
-                    created_in = [
-                        loc
-                        for enabled, loc in (
-                            (options.app_menu, "the application menu"),
-                            (options.desktop, "the Desktop"),
+                    requested = [
+                        location
+                        for location, enabled in (
+                            ("app_menu", options.app_menu),
+                            ("desktop", options.desktop),
                         )
                         if enabled
                     ]
-                    print(
-                        f"Successfully created '{shortcut_name}' in "
-                        f"{' and '.join(created_in)}."
-                    )
+                    existing = [
+                        _shortcut_path(location, system_scope=options.system)
+                        for location in requested
+                    ]
+                    if all(
+                        path is not None
+                        and _shortcut_up_to_date(
+                            path,
+                            target_script,
+                            target_args,
+                            icon_path,
+                            file_assoc=options.file_assoc,
+                        )
+                        for path in existing
+                    ):
+                        print(f"'{shortcut_name}' shortcut is up to date; skipping.")
+                    else:
+                        with _com_initialized():
+                            make_shortcut(
+                                script=full_command,
+                                name=shortcut_name,
+                                icon=icon_path,
+                                desktop=options.desktop,
+                                startmenu=options.app_menu,
+                                noexe=True,
+                            )
+                        if system == "Windows" and options.system:
+                            _move_windows_shortcuts_to_all_users(
+                                options.desktop, options.app_menu
+                            )
+                        created_in = [
+                            loc
+                            for enabled, loc in (
+                                (options.app_menu, "the application menu"),
+                                (options.desktop, "the Desktop"),
+                            )
+                            if enabled
+                        ]
+                        print(
+                            f"Successfully created '{shortcut_name}' in "
+                            f"{' and '.join(created_in)}."
+                        )
 
             if system == "Linux" and options.file_assoc:
                 register_file_associations_linux(system=options.system)
@@ -1443,14 +1661,11 @@ end open
 
                 destinations = []
                 if options.app_menu:
-                    apps_dir = (
-                        Path("/Applications")
-                        if options.system
-                        else Path.home() / "Applications"
+                    destinations.append(
+                        _shortcut_path("app_menu", system_scope=options.system)
                     )
-                    destinations.append(apps_dir / target_app_name)
                 if options.desktop:
-                    destinations.append(Path.home() / "Desktop" / target_app_name)
+                    destinations.append(_shortcut_path("desktop"))
 
                 for dest_app in destinations:
                     dest_app.parent.mkdir(parents=True, exist_ok=True)
@@ -1610,9 +1825,10 @@ def main() -> int:
         return 0
 
     if args.check:
+        system = platform.system()
         command_name = "moleditpy"
         path = find_executable(command_name)
-        if not path and platform.system() == "Linux":
+        if not path and system == "Linux":
             command_name = "moleditpy-linux"
             path = find_executable(command_name)
         if path:
@@ -1620,7 +1836,7 @@ def main() -> int:
 
             # On macOS the shortcut pairs the script with its environment's
             # interpreter — verify that pairing actually launches.
-            if platform.system() == "Darwin":
+            if system == "Darwin":
                 interpreter = python_for_executable(path)
                 print(f"Launcher interpreter: {interpreter}")
                 if verify_launch_command(interpreter, path):
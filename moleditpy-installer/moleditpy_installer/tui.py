@@ -181,6 +181,9 @@ class InstallerApp(App):
         if path:
             self.call_from_thread(self._set_detect_status, f"Found moleditpy: {path}")
         else:
+            # Don't let a cached miss hide an executable installed while
+            # the TUI is open; Install must search again.
+            installer.find_executable.cache_clear()
             self.call_from_thread(
                 self._set_detect_status,
                 "moleditpy executable not found — install it first (pip install moleditpy)",
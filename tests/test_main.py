@@ -43,22 +43,36 @@ def _make_winreg_mock():
     m.HKEY_CURRENT_USER = 0x80000001
     m.HKEY_LOCAL_MACHINE = 0x80000002
     m.KEY_ALL_ACCESS = 0xF003F
+    m.KEY_WRITE = 0x20006
     m.REG_SZ = 1
+    m.REG_EXPAND_SZ = 2
 
     fake_key = mock.MagicMock()
     fake_key.__enter__ = mock.Mock(return_value=fake_key)
     fake_key.__exit__ = mock.Mock(return_value=False)
 
     m.CreateKey = mock.Mock(return_value=fake_key)
+    m.CreateKeyEx = mock.Mock(return_value=fake_key)
     m.OpenKey = mock.Mock(return_value=fake_key)
     m.SetValue = mock.Mock()
+    m.SetValueEx = mock.Mock()
     m.DeleteKey = mock.Mock()
     m.QueryInfoKey = mock.Mock(return_value=(0, 0, 0))  # 0 subkeys by default
-    m.EnumKey = mock.Mock(return_value="subkey")
+    m.EnumKey = mock.Mock(side_effect=OSError("no more items"))
     m.CloseKey = mock.Mock()
     return m
 
 
+@pytest.fixture(autouse=True)
+def _clear_lookup_caches():
+    """Every test gets a fresh executable/icon lookup (results are cached)."""
+    installer_main.find_executable.cache_clear()
+    installer_main._resolve_icon.cache_clear()
+    yield
+    installer_main.find_executable.cache_clear()
+    installer_main._resolve_icon.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # find_executable
 # ---------------------------------------------------------------------------
@@ -76,10 +90,8 @@ class TestFindExecutable:
         with mock.patch.object(
             installer_main.sys, "executable", str(tmp_path / "python.exe")
         ):
-            with mock.patch.object(
-                installer_main.sys, "argv", [str(tmp_path / "some_script.py")]
-            ):
-                with mock.patch("shutil.which", return_value=None):
+            with mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path):
+                with mock.patch.dict(os.environ, {"PATH": ""}):
                     result = installer_main.find_executable("moleditpy")
 
         assert result is not None
@@ -94,10 +106,8 @@ class TestFindExecutable:
                 mock.patch.object(
                     installer_main.sys, "executable", str(tmp_path / "python")
                 ),
-                mock.patch.object(
-                    installer_main.sys, "argv", [str(tmp_path / "some_script.py")]
-                ),
-                mock.patch("shutil.which", return_value=None),
+                mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path),
+                mock.patch.dict(os.environ, {"PATH": ""}),
             ):
                 result = installer_main.find_executable("moleditpy")
 
@@ -111,10 +121,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(tmp_path / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(tmp_path / "some_script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path),
+            mock.patch.dict(os.environ, {"PATH": ""}),
         ):
             result = installer_main.find_executable("moleditpy")
 
@@ -133,42 +141,86 @@ class TestFindExecutable:
         with mock.patch.object(
             installer_main.sys, "executable", str(fake_python_dir / "python.exe")
         ):
-            with mock.patch.object(
-                installer_main.sys, "argv", [str(scripts / "moleditpy-installer")]
-            ):
-                with mock.patch("shutil.which", return_value=None):
+            with mock.patch.object(installer_main, "_SCRIPT_DIR", scripts):
+                with mock.patch.dict(os.environ, {"PATH": ""}):
                     result = installer_main.find_executable("moleditpy")
 
         assert result is not None
 
-    def test_falls_back_to_shutil_which(self, tmp_path):
-        """If not found locally, shutil.which result is returned."""
-        fake_path = str(tmp_path / "moleditpy")
+    def test_falls_back_to_system_path(self, tmp_path):
+        """If not found locally, the executable is looked up on PATH."""
+        on_path = tmp_path / "on_path"
+        on_path.mkdir()
+        exe = _make_fake_exe(on_path, "moleditpy")
 
-        with mock.patch.object(
-            installer_main.sys, "executable", str(tmp_path / "python.exe")
+        with (
+            mock.patch.object(
+                installer_main.sys, "executable", str(tmp_path / "python.exe")
+            ),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path),
+            mock.patch("pathlib.Path.home", return_value=tmp_path / "home"),
+            mock.patch.dict(os.environ, {"PATH": str(on_path)}),
         ):
-            with mock.patch.object(
-                installer_main.sys, "argv", [str(tmp_path / "script.py")]
-            ):
-                with mock.patch("shutil.which", return_value=fake_path):
-                    result = installer_main.find_executable("moleditpy")
+            result = installer_main.find_executable("moleditpy")
+
+        assert result == str(exe)
 
-        assert result == fake_path
+    def test_system_path_prefers_pathext_match_on_windows(self, tmp_path):
+        """An extensionless file on PATH must not shadow moleditpy.exe."""
+        on_path = tmp_path / "on_path"
+        on_path.mkdir()
+        for file_name in ("moleditpy", "moleditpy.exe"):
+            path = on_path / file_name
+            path.write_bytes(b"")
+            path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+        env = {"PATH": str(on_path), "PATHEXT": os.pathsep.join([".COM", ".EXE"])}
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(
+                installer_main.sys, "executable", str(tmp_path / "python.exe")
+            ),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path),
+            mock.patch("pathlib.Path.home", return_value=tmp_path / "home"),
+            mock.patch.object(
+                installer_main.sysconfig, "get_path", side_effect=KeyError
+            ),
+            mock.patch.dict(os.environ, env, clear=True),
+        ):
+            result = installer_main.find_executable("moleditpy")
+
+        assert result == str(on_path / "moleditpy.exe")
 
     def test_returns_none_when_not_found(self, tmp_path):
         """Returns None when the executable cannot be located anywhere."""
         with mock.patch.object(
             installer_main.sys, "executable", str(tmp_path / "python.exe")
         ):
-            with mock.patch.object(
-                installer_main.sys, "argv", [str(tmp_path / "script.py")]
-            ):
-                with mock.patch("shutil.which", return_value=None):
+            with mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path):
+                with mock.patch.dict(os.environ, {"PATH": ""}):
                     result = installer_main.find_executable("nonexistent_app")
 
         assert result is None
 
+    def test_result_is_cached_per_name(self, tmp_path):
+        """A repeated lookup reuses the first result instead of re-probing."""
+        _make_fake_exe(tmp_path, "moleditpy")
+
+        with (
+            mock.patch.object(
+                installer_main.sys, "executable", str(tmp_path / "python.exe")
+            ),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path),
+            mock.patch.dict(os.environ, {"PATH": ""}),
+        ):
+            first = installer_main.find_executable("moleditpy")
+            with mock.patch.object(Path, "is_file") as mock_is_file:
+                second = installer_main.find_executable("moleditpy")
+
+        assert first is not None
+        assert second == first
+        mock_is_file.assert_not_called()
+
     def test_finds_exe_in_user_local_bin(self, tmp_path):
         """~/.local/bin is searched for pip --user installs on Linux/macOS."""
         user_local_bin = tmp_path / ".local" / "bin"
@@ -182,10 +234,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
         ):
             _make_fake_exe(user_local_bin, "moleditpy")
@@ -207,10 +257,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -233,10 +281,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("sysconfig.get_path", return_value=str(sysconfig_bin)),
         ):
             _make_fake_exe(sysconfig_bin, "moleditpy")
@@ -258,10 +304,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("sysconfig.get_scheme_names", return_value=["posix_user"]),
             mock.patch("sysconfig.get_path", return_value=str(sysconfig_bin)),
         ):
@@ -284,10 +328,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch.dict(os.environ, {"LOCALAPPDATA": str(tmp_path)}, clear=False),
         ):
             _make_fake_exe(scripts_dir, "moleditpy")
@@ -317,10 +359,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch.dict(os.environ, {"LOCALAPPDATA": str(tmp_path)}, clear=False),
             mock.patch("sysconfig.get_path", side_effect=KeyError("mocked error")),
         ):
@@ -343,10 +383,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch.dict(os.environ, {"APPDATA": str(tmp_path)}, clear=False),
             mock.patch("sysconfig.get_path", side_effect=KeyError("mocked error")),
         ):
@@ -369,10 +407,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_path", side_effect=KeyError("mocked error")),
         ):
@@ -395,10 +431,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -421,10 +455,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -447,10 +479,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -475,10 +505,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_path", side_effect=KeyError("mocked error")),
         ):
@@ -501,10 +529,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python.exe")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch.dict(os.environ, {"LOCALAPPDATA": str(tmp_path)}, clear=False),
             mock.patch.dict(os.environ, {"APPDATA": str(tmp_path)}, clear=False),
             mock.patch("sysconfig.get_path", side_effect=KeyError("mocked error")),
@@ -528,10 +554,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -563,10 +587,8 @@ class TestFindExecutable:
             mock.patch.object(
                 installer_main.sys, "executable", str(fake_python_dir / "python")
             ),
-            mock.patch.object(
-                installer_main.sys, "argv", [str(fake_python_dir / "script.py")]
-            ),
-            mock.patch("shutil.which", return_value=None),
+            mock.patch.object(installer_main, "_SCRIPT_DIR", fake_python_dir),
+            mock.patch.dict(os.environ, {"PATH": ""}),
             mock.patch("pathlib.Path.home", return_value=tmp_path),
             mock.patch("sysconfig.get_scheme_names", return_value=[]),
         ):
@@ -613,6 +635,30 @@ class TestGetIconPath:
             path = installer_main.get_icon_path()
         assert path is None or path.endswith(".icns")
 
+    def test_icon_extracted_once_per_process(self):
+        with (
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch.object(
+                installer_main, "_extract_data_file", return_value="/x/icon.png"
+            ) as mock_extract,
+        ):
+            assert installer_main.get_icon_path() == "/x/icon.png"
+            assert installer_main.get_icon_path() == "/x/icon.png"
+        mock_extract.assert_called_once_with("icon.png")
+
+    def test_failed_extraction_is_retried(self):
+        with (
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch.object(
+                installer_main,
+                "_extract_data_file",
+                side_effect=[None, "/x/icon.png"],
+            ) as mock_extract,
+        ):
+            assert installer_main.get_icon_path() is None
+            assert installer_main.get_icon_path() == "/x/icon.png"
+        assert mock_extract.call_count == 2
+
     def test_returns_none_on_unknown_os(self):
         with mock.patch("platform.system", return_value="FreeBSD"):
             path = installer_main.get_icon_path()
@@ -705,9 +751,52 @@ class TestRegisterFileAssociationsWindows:
             )
 
         assert result is True
-        assert (
-            winreg_mock.CreateKey.call_count >= 4
-        )  # ProgID + DefaultIcon + command + 2 exts
+        # Software\Classes is opened once from the hive root ...
+        winreg_mock.CreateKey.assert_called_once_with(
+            winreg_mock.HKEY_CURRENT_USER, "Software\\Classes"
+        )
+        # ... and every other key is created relative to an open handle
+        created = [c.args[1] for c in winreg_mock.CreateKeyEx.call_args_list]
+        assert created == [
+            "MoleditPy.File",
+            "DefaultIcon",
+            "shell\\open",
+            "command",
+            ".pmeprj",
+        ]
+
+    def test_command_and_icon_are_expandable_profile_paths(self, tmp_path):
+        local = tmp_path / "AppData" / "Local"
+        exe = local / "Programs" / "Python" / "Scripts" / "moleditpy.exe"
+        icon = local / "MoleditPy" / "installer" / "file_icon.ico"
+        icon.parent.mkdir(parents=True)
+        icon.write_bytes(b"")
+        winreg_mock = _make_winreg_mock()
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.dict(
+                os.environ,
+                {"LOCALAPPDATA": str(local), "USERPROFILE": str(tmp_path)},
+                clear=True,
+            ),
+        ):
+            assert installer_main.register_file_associations_windows(
+                str(exe), str(icon)
+            )
+
+        expanded_icon = os.path.join(
+            "%LOCALAPPDATA%", "MoleditPy", "installer", "file_icon.ico"
+        )
+        expanded_exe = os.path.join(
+            "%LOCALAPPDATA%", "Programs", "Python", "Scripts", "moleditpy.exe"
+        )
+        values = [c.args[3:] for c in winreg_mock.SetValueEx.call_args_list]
+        assert values == [
+            (winreg_mock.REG_EXPAND_SZ, expanded_icon),
+            (winreg_mock.REG_EXPAND_SZ, f'"{expanded_exe}" "%1"'),
+        ]
 
     def test_returns_false_on_oserror(self):
         winreg_mock = _make_winreg_mock()
@@ -723,6 +812,71 @@ class TestRegisterFileAssociationsWindows:
 
         assert result is False
 
+    def test_partial_failure_rolls_back(self, capsys):
+        """A failure after some keys were written removes them again."""
+        winreg_mock = _make_winreg_mock()
+        fake_key = winreg_mock.CreateKey.return_value
+        winreg_mock.CreateKeyEx.side_effect = [
+            fake_key,  # ProgID
+            fake_key,  # shell\open
+            PermissionError("access denied"),  # shell\open\command
+        ]
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.object(installer_main, "delete_registry_tree") as mock_del,
+            mock.patch.object(
+                installer_main, "unregister_file_associations_windows"
+            ) as mock_unregister,
+        ):
+            result = installer_main.register_file_associations_windows(
+                r"C:\app\moleditpy.exe", None, system=True
+            )
+
+        assert result is False
+        # only the ProgID this call created is removed; .pmeraw and the
+        # Explorer FileExts choice are left alone
+        mock_unregister.assert_not_called()
+        mock_del.assert_called_once_with(
+            winreg_mock.HKEY_LOCAL_MACHINE, "Software\\Classes\\MoleditPy.File"
+        )
+        assert "rolling back" in capsys.readouterr().out.lower()
+
+    def test_failure_before_prog_id_skips_rollback(self, capsys):
+        winreg_mock = _make_winreg_mock()
+        winreg_mock.CreateKey.side_effect = PermissionError("access denied")
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.object(installer_main, "delete_registry_tree") as mock_del,
+        ):
+            result = installer_main.register_file_associations_windows(
+                r"C:\app\moleditpy.exe", None
+            )
+
+        assert result is False
+        mock_del.assert_not_called()
+        assert "rolling back" not in capsys.readouterr().out.lower()
+
+    def test_trusts_resolved_icon_path_without_restat(self):
+        """The icon producers already wrote the file; no second stat."""
+        winreg_mock = _make_winreg_mock()
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch("os.path.exists") as mock_exists,
+        ):
+            assert installer_main.register_file_associations_windows(
+                r"C:\app\moleditpy.exe", r"C:\icons\file_icon.ico"
+            )
+
+        mock_exists.assert_not_called()
+        created = [c.args[1] for c in winreg_mock.CreateKeyEx.call_args_list]
+        assert "DefaultIcon" in created
+
     def test_skips_icon_when_path_missing(self):
         winreg_mock = _make_winreg_mock()
 
@@ -737,6 +891,40 @@ class TestRegisterFileAssociationsWindows:
         assert result is True
 
 
+class TestExpandableRegistryPath:
+    def test_prefers_most_specific_profile_variable(self, tmp_path):
+        env = {
+            "USERPROFILE": str(tmp_path),
+            "APPDATA": str(tmp_path / "AppData" / "Roaming"),
+        }
+        path = tmp_path / "AppData" / "Roaming" / "Python" / "moleditpy.exe"
+        with mock.patch.dict(os.environ, env, clear=True):
+            result = installer_main._expandable_registry_path(str(path))
+        assert result == os.path.join("%APPDATA%", "Python", "moleditpy.exe")
+
+    def test_path_outside_profile_is_kept(self, tmp_path):
+        path = str(tmp_path / "elsewhere" / "moleditpy.exe")
+        env = {"USERPROFILE": str(tmp_path / "home")}
+        with mock.patch.dict(os.environ, env, clear=True):
+            assert installer_main._expandable_registry_path(path) == path
+
+    def test_system_scope_ignores_per_user_variables(self, tmp_path):
+        env = {
+            "USERPROFILE": str(tmp_path),
+            "PROGRAMDATA": str(tmp_path / "ProgramData"),
+        }
+        user_path = str(tmp_path / "miniconda3" / "Scripts" / "moleditpy.exe")
+        icon = tmp_path / "ProgramData" / "MoleditPy" / "file_icon.ico"
+        with mock.patch.dict(os.environ, env, clear=True):
+            assert (
+                installer_main._expandable_registry_path(user_path, system=True)
+                == user_path
+            )
+            assert installer_main._expandable_registry_path(
+                str(icon), system=True
+            ) == os.path.join("%PROGRAMDATA%", "MoleditPy", "file_icon.ico")
+
+
 # ---------------------------------------------------------------------------
 # register_file_associations_darwin
 # ---------------------------------------------------------------------------
@@ -840,7 +1028,6 @@ class TestRegisterFileAssociationsDarwin:
 class TestDeleteRegistryTree:
     def test_deletes_key_with_no_subkeys(self):
         winreg_mock = _make_winreg_mock()
-        winreg_mock.QueryInfoKey.return_value = (0, 0, 0)
 
         with mock.patch.object(installer_main, "winreg", winreg_mock):
             result = installer_main.delete_registry_tree(
@@ -850,9 +1037,48 @@ class TestDeleteRegistryTree:
         assert result is True
         winreg_mock.DeleteKey.assert_called_once()
 
-    def test_returns_false_on_oserror(self):
+    def test_deletes_subkeys_until_enumeration_is_empty(self):
+        """Children are re-enumerated at index 0 until EnumKey runs dry."""
         winreg_mock = _make_winreg_mock()
-        winreg_mock.OpenKey.side_effect = OSError("not found")
+        winreg_mock.EnumKey.side_effect = [
+            "shell",  # parent: first child
+            OSError,  # shell has no children
+            "DefaultIcon",  # parent: next child after 'shell' was removed
+            OSError,  # DefaultIcon has no children
+            OSError,  # parent is empty
+        ]
+
+        with mock.patch.object(installer_main, "winreg", winreg_mock):
+            result = installer_main.delete_registry_tree(
+                winreg_mock.HKEY_CURRENT_USER, "MoleditPy.File"
+            )
+
+        assert result is True
+        deleted = [c.args[1] for c in winreg_mock.DeleteKey.call_args_list]
+        assert deleted == ["shell", "DefaultIcon", "MoleditPy.File"]
+        assert winreg_mock.CloseKey.call_count == 3
+
+    def test_unopenable_child_does_not_loop_forever(self):
+        """A child that is listed but cannot be opened must end the loop."""
+        winreg_mock = _make_winreg_mock()
+        fake_key = winreg_mock.OpenKey.return_value
+        winreg_mock.OpenKey.side_effect = [fake_key, FileNotFoundError]
+        winreg_mock.EnumKey.side_effect = None
+        winreg_mock.EnumKey.return_value = "ghost"  # listed forever
+        winreg_mock.DeleteKey.side_effect = PermissionError("key has subkeys")
+
+        with (
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            pytest.raises(PermissionError),
+        ):
+            installer_main.delete_registry_tree(winreg_mock.HKEY_CURRENT_USER, "key")
+
+        assert winreg_mock.EnumKey.call_count == 1
+        winreg_mock.CloseKey.assert_called_once_with(fake_key)
+
+    def test_returns_false_when_key_missing(self):
+        winreg_mock = _make_winreg_mock()
+        winreg_mock.OpenKey.side_effect = FileNotFoundError("not found")
 
         with mock.patch.object(installer_main, "winreg", winreg_mock):
             result = installer_main.delete_registry_tree(
@@ -861,6 +1087,21 @@ class TestDeleteRegistryTree:
 
         assert result is False
 
+    def test_access_denied_propagates_and_closes_key(self):
+        """A real failure is not reported as 'already gone', and the
+        opened handle is not leaked."""
+        winreg_mock = _make_winreg_mock()
+        winreg_mock.EnumKey.side_effect = ["child", OSError]
+        winreg_mock.DeleteKey.side_effect = PermissionError("access denied")
+
+        with (
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            pytest.raises(PermissionError),
+        ):
+            installer_main.delete_registry_tree(winreg_mock.HKEY_CURRENT_USER, "key")
+
+        assert winreg_mock.CloseKey.call_count == 2  # child and parent
+
 
 # ---------------------------------------------------------------------------
 # unregister_file_associations_windows
@@ -884,9 +1125,20 @@ class TestUnregisterFileAssociationsWindows:
         ):
             installer_main.unregister_file_associations_windows()
 
-        assert winreg_mock.DeleteKey.call_count == 2  # .pmeprj and .pmeraw
+        # Software\Classes is opened once; deletions are relative to it
+        winreg_mock.OpenKey.assert_called_once_with(
+            winreg_mock.HKEY_CURRENT_USER,
+            "Software\\Classes",
+            0,
+            winreg_mock.KEY_WRITE,
+        )
+        classes_key = winreg_mock.OpenKey.return_value
+        assert winreg_mock.DeleteKey.call_args_list == [
+            mock.call(classes_key, ".pmeprj"),
+            mock.call(classes_key, ".pmeraw"),
+        ]
+        assert mock.call(classes_key, "MoleditPy.File") in mock_del.call_args_list
         deleted = [c.args[1] for c in mock_del.call_args_list]
-        assert r"Software\Classes\MoleditPy.File" in deleted
         # Explorer's per-user FileExts cache must be cleared too, or the
         # association looks still present after uninstall
         assert (
@@ -926,6 +1178,65 @@ class TestUnregisterFileAssociationsWindows:
         captured = capsys.readouterr()
         assert "failed" in captured.out.lower()
 
+    def test_missing_classes_key_is_not_an_error(self, capsys):
+        winreg_mock = _make_winreg_mock()
+        winreg_mock.OpenKey.side_effect = FileNotFoundError
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.object(
+                installer_main, "delete_registry_tree", return_value=False
+            ) as mock_del,
+        ):
+            installer_main.unregister_file_associations_windows(system=True)
+
+        winreg_mock.DeleteKey.assert_not_called()
+        mock_del.assert_called_once()  # only the Explorer FileExts cleanup
+        assert "error" not in capsys.readouterr().out.lower()
+
+    def test_unopenable_classes_key_is_reported_and_cleanup_continues(self, capsys):
+        winreg_mock = _make_winreg_mock()
+        winreg_mock.OpenKey.side_effect = PermissionError("access denied")
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.object(
+                installer_main, "delete_registry_tree", return_value=False
+            ) as mock_del,
+            mock.patch.object(
+                installer_main, "_notify_windows_assoc_changed"
+            ) as mock_notify,
+        ):
+            installer_main.unregister_file_associations_windows(system=True)
+
+        out = capsys.readouterr().out
+        assert "Failed to open Software\\Classes" in out
+        assert "Error during file association removal" not in out
+        winreg_mock.DeleteKey.assert_not_called()
+        # the Explorer FileExts cleanup and the shell notification still run
+        mock_del.assert_called_once()
+        mock_notify.assert_called_once()
+
+    def test_reports_tree_removal_failure_and_continues(self, capsys):
+        winreg_mock = _make_winreg_mock()
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.object(installer_main, "winreg", winreg_mock),
+            mock.patch.object(
+                installer_main,
+                "delete_registry_tree",
+                side_effect=PermissionError("access denied"),
+            ) as mock_del,
+        ):
+            installer_main.unregister_file_associations_windows()
+
+        assert "failed to remove" in capsys.readouterr().out.lower()
+        # the Explorer FileExts cleanup still runs after the ProgID failure
+        assert mock_del.call_count == 2
+
 
 # ---------------------------------------------------------------------------
 # remove_shortcut
@@ -1030,6 +1341,21 @@ class TestRemoveShortcut:
 
         assert not persistent.exists()
 
+    def test_remove_forgets_cached_icon_paths(self, tmp_path):
+        """The extracted icons are deleted, so their cached paths must go."""
+        with mock.patch.object(
+            installer_main, "_extract_data_file", return_value="/x/icon.png"
+        ):
+            installer_main._resolve_icon("icon.png")
+
+        with (
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch("pathlib.Path.home", return_value=tmp_path),
+        ):
+            installer_main.remove_shortcut()
+
+        assert installer_main._resolve_icon.cache_info().currsize == 0
+
     def test_prints_message_when_shortcut_missing(self, capsys):
         with (
             mock.patch("platform.system", return_value="Linux"),
@@ -1117,6 +1443,23 @@ class TestInstall:
         assert kwargs.get("desktop") is False
         mock_assoc.assert_called_once()
 
+    def test_install_logs_resolved_executable(self, tmp_path, capsys):
+        """The path is logged even when find_executable() hits its cache
+        and prints nothing itself."""
+        fake_exe = str(tmp_path / "moleditpy")
+
+        with (
+            mock.patch.object(installer_main, "find_executable", return_value=fake_exe),
+            mock.patch.object(installer_main, "get_icon_path", return_value=None),
+            mock.patch.object(installer_main, "register_file_associations_linux"),
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch("moleditpy_installer.main.make_shortcut"),
+            mock.patch.dict(os.environ, {}, clear=True),
+        ):
+            installer_main.install()
+
+        assert f"Using executable: {fake_exe}" in capsys.readouterr().out
+
     def test_install_calls_make_shortcut_on_linux(self, tmp_path):
         fake_exe = str(tmp_path / "moleditpy")
 
@@ -1413,6 +1756,120 @@ class TestInstall:
         assert "failed" in captured.out.lower()
 
 
+class TestShortcutUpToDate:
+    def _fake_win32com(self, target, arguments="", icon=""):
+        link = mock.Mock(TargetPath=target, Arguments=arguments, IconLocation=icon)
+        client = types.ModuleType("win32com.client")
+        client.Dispatch = mock.Mock(
+            return_value=mock.Mock(CreateShortcut=mock.Mock(return_value=link))
+        )
+        package = types.ModuleType("win32com")
+        package.client = client
+        return {"win32com": package, "win32com.client": client}
+
+    def test_shortcut_paths_per_os(self, tmp_path):
+        with (
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch.dict(os.environ, {"XDG_DATA_HOME": str(tmp_path)}),
+        ):
+            assert installer_main._shortcut_path("app_menu") == (
+                tmp_path / "applications" / "MoleditPy.desktop"
+            )
+            assert installer_main._shortcut_path("desktop", system_scope=True) is None
+
+        with (
+            mock.patch("platform.system", return_value="Windows"),
+            mock.patch.dict(os.environ, {}, clear=True),
+        ):
+            assert installer_main._shortcut_path("app_menu") is None  # no APPDATA
+
+    def test_linux_entry_with_same_command_is_up_to_date(self, tmp_path):
+        icon = tmp_path / "icon.png"
+        entry = tmp_path / "MoleditPy.desktop"
+        entry.write_text(
+            "[Desktop Entry]\n"
+            "Exec=/env/bin/moleditpy %f\n"  # %f appended by the MIME patch
+            f"Icon={icon}\n",
+            encoding="utf-8",
+        )
+
+        with mock.patch("platform.system", return_value="Linux"):
+            assert installer_main._shortcut_up_to_date(
+                entry, "/env/bin/moleditpy", "", str(icon), file_assoc=True
+            )
+            assert not installer_main._shortcut_up_to_date(
+                entry, "/other/bin/moleditpy", "", str(icon), file_assoc=True
+            )
+            assert not installer_main._shortcut_up_to_date(
+                entry,
+                "/env/bin/moleditpy",
+                "",
+                str(tmp_path / "new_icon.png"),
+                file_assoc=True,
+            )
+
+    def test_linux_entry_mime_binding_must_match_file_assoc(self, tmp_path):
+        patched = tmp_path / "patched.desktop"
+        patched.write_text(
+            "[Desktop Entry]\n"
+            "Exec=/env/bin/moleditpy %f\n"
+            "MimeType=application/x-moleditpy-project;\n",
+            encoding="utf-8",
+        )
+        plain = tmp_path / "plain.desktop"
+        plain.write_text("[Desktop Entry]\nExec=/env/bin/moleditpy\n", encoding="utf-8")
+
+        with mock.patch("platform.system", return_value="Linux"):
+            # --no-file-assoc must rewrite an entry that still binds the MIME type
+            assert not installer_main._shortcut_up_to_date(
+                patched, "/env/bin/moleditpy", "", None, file_assoc=False
+            )
+            assert not installer_main._shortcut_up_to_date(
+                plain, "/env/bin/moleditpy", "", None, file_assoc=True
+            )
+            assert installer_main._shortcut_up_to_date(
+                plain, "/env/bin/moleditpy", "", None, file_assoc=False
+            )
+
+    def test_windows_lnk_target_and_arguments_are_compared(self, tmp_path):
+        lnk = tmp_path / "MoleditPy.lnk"
+        lnk.write_bytes(b"x")
+        exe = str(tmp_path / "moleditpy.exe")
+
+        with mock.patch("platform.system", return_value="Windows"):
+            with mock.patch.dict(sys.modules, self._fake_win32com(exe, " ")):
+                assert installer_main._shortcut_up_to_date(lnk, exe, "", None)
+            with mock.patch.dict(sys.modules, self._fake_win32com(exe, "run -n base")):
+                assert not installer_main._shortcut_up_to_date(lnk, exe, "", None)
+
+    def test_missing_shortcut_is_out_of_date(self, tmp_path):
+        with mock.patch("platform.system", return_value="Linux"):
+            assert not installer_main._shortcut_up_to_date(
+                tmp_path / "MoleditPy.desktop", "/env/bin/moleditpy", "", None
+            )
+
+    def test_install_skips_make_shortcut_when_up_to_date(self, tmp_path, capsys):
+        fake_exe = str(tmp_path / "moleditpy")
+
+        with (
+            mock.patch.object(installer_main, "find_executable", return_value=fake_exe),
+            mock.patch.object(installer_main, "get_icon_path", return_value=None),
+            mock.patch.object(installer_main, "register_file_associations_linux"),
+            mock.patch.object(
+                installer_main, "_shortcut_up_to_date", return_value=True
+            ) as mock_check,
+            mock.patch("platform.system", return_value="Linux"),
+            mock.patch("moleditpy_installer.main.make_shortcut") as mock_shortcut,
+            mock.patch.dict(os.environ, {}, clear=True),
+        ):
+            assert installer_main.install() == 0
+
+        mock_shortcut.assert_not_called()
+        mock_check.assert_called_once()
+        assert mock_check.call_args.kwargs["file_assoc"] is True
+        assert "up to date" in capsys.readouterr().out
+
+
 # ---------------------------------------------------------------------------
 # main() CLI
 # ---------------------------------------------------------------------------
@@ -2137,10 +2594,8 @@ class TestSystemCondaSearch:
                 mock.patch.object(
                     installer_main.sys, "executable", str(tmp_path / "py" / "python")
                 ),
-                mock.patch.object(
-                    installer_main.sys, "argv", [str(tmp_path / "py" / "x.py")]
-                ),
-                mock.patch("shutil.which", return_value=None),
+                mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path / "py"),
+                mock.patch.dict(os.environ, {"PATH": ""}),
                 mock.patch("pathlib.Path.home", return_value=tmp_path / "home"),
             ):
                 result = installer_main.find_executable("moleditpy")
@@ -2160,10 +2615,8 @@ class TestSystemCondaSearch:
                 mock.patch.object(
                     installer_main.sys, "executable", str(tmp_path / "py" / "python")
                 ),
-                mock.patch.object(
-                    installer_main.sys, "argv", [str(tmp_path / "py" / "x.py")]
-                ),
-                mock.patch("shutil.which", return_value=None),
+                mock.patch.object(installer_main, "_SCRIPT_DIR", tmp_path / "py"),
+                mock.patch.dict(os.environ, {"PATH": ""}),
                 mock.patch("pathlib.Path.home", return_value=tmp_path / "home"),
             ):
                 result = installer_main.find_executable("moleditpy")
@@ -2440,6 +2893,36 @@ class TestTui:
 
         asyncio.run(check())
 
+    def test_detection_miss_is_not_cached_for_install(self):
+        """A 'not found' at TUI start must not stick: moleditpy may be
+        installed while the TUI is open, and Install has to search again."""
+        import functools
+
+        from moleditpy_installer.tui import InstallerApp
+
+        fake_find = functools.cache(lambda name: None)
+        app = InstallerApp()
+        with (
+            mock.patch.object(installer_main, "find_executable", fake_find),
+            mock.patch.object(app, "call_from_thread"),
+        ):
+            app._detect_executable()
+        assert fake_find.cache_info().currsize == 0
+
+    def test_detection_hit_is_reused_by_install(self):
+        import functools
+
+        from moleditpy_installer.tui import InstallerApp
+
+        fake_find = functools.cache(lambda name: "/env/bin/moleditpy")
+        app = InstallerApp()
+        with (
+            mock.patch.object(installer_main, "find_executable", fake_find),
+            mock.patch.object(app, "call_from_thread"),
+        ):
+            app._detect_executable()
+        assert fake_find.cache_info().currsize == 1
+
     def test_install_button_runs_install(self):
         import asyncio
 